@@ -0,0 +1,41 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Measures how long it takes to import maze_solver in a fresh interpreter,
+# compared with a bare interpreter start. pygame is only imported by
+# init_display(), so when pygame is installed its import time is shown too
+# as the cost the visualizer pays on top.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RUNS = 10
+
+
+def time_command(code):
+    samples = []
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - t0)
+    return min(samples), statistics.median(samples)
+
+
+def main():
+    base_min, base_med = time_command("pass")
+    imp_min, imp_med = time_command("import maze_solver")
+    print(f"bare interpreter  : min {base_min * 1000:7.1f} ms  median {base_med * 1000:7.1f} ms")
+    print(f"import maze_solver: min {imp_min * 1000:7.1f} ms  median {imp_med * 1000:7.1f} ms")
+    print(f"import overhead   : {(imp_med - base_med) * 1000:7.1f} ms (median)")
+    try:
+        pg_min, pg_med = time_command("import pygame")
+    except subprocess.CalledProcessError:
+        print("import pygame     : not installed")
+    else:
+        print(f"import pygame     : min {pg_min * 1000:7.1f} ms  median {pg_med * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
-import pygame
 import math
 from queue import PriorityQueue, Queue
 import sys
 import time
 import random
-
-# Initialize pygame
-pygame.init()
+import struct
+from bisect import bisect_right
+from collections import OrderedDict, deque
+import hashlib
+import heapq
+import os
+import shutil
+import tempfile
 
 # Screen dimensions - now resizable
 WIDTH = 1400
@@ -52,18 +56,75 @@ COLORS = {
     'shadow': (10, 15, 32, 100)
 }
 
-# Pygame screen - now resizable
-WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption("Maze Solver Pro - Pathfinding Visualizer")
-
-# Fonts
-try:
-    FONT_SANS = 'Segoe UI'
-    FONT_SANS_BOLD = 'Segoe UI'
-    pygame.font.SysFont(FONT_SANS, 16)
-except:
-    FONT_SANS = 'Arial'
-    FONT_SANS_BOLD = 'Arial'
+# Cell states stored in search traces, and the colors they replay as
+STATE_EMPTY = 0
+STATE_START = 1
+STATE_END = 2
+STATE_WALL = 3
+STATE_OPEN = 4
+STATE_CLOSED = 5
+STATE_PATH = 6
+STATE_COLORS = [
+    COLORS['surface'], COLORS['start'], COLORS['end'], COLORS['wall'],
+    COLORS['frontier'], COLORS['visited'], COLORS['path'],
+]
+
+# Active TraceRecorder, if any; Node state changes are appended to it
+TRACE = None
+
+# pygame itself, the screen and fonts are all set up lazily by
+# init_display(), so importing this module does no display or font work
+# and headless callers do not need pygame installed
+pygame = None
+WIN = None
+FONT_SANS = None
+FONT_SANS_BOLD = None
+_FONT_CACHE = {}
+
+
+# =================== LAZY DISPLAY SETUP ===================
+def init_fonts():
+    """Resolve the UI font family once, on first use"""
+    global FONT_SANS, FONT_SANS_BOLD
+    if FONT_SANS is not None:
+        return
+    try:
+        FONT_SANS = 'Segoe UI'
+        FONT_SANS_BOLD = 'Segoe UI'
+        pygame.font.SysFont(FONT_SANS, 16)
+    except:
+        FONT_SANS = 'Arial'
+        FONT_SANS_BOLD = 'Arial'
+
+def get_font(size, bold=False):
+    """Return a cached SysFont so fonts are not rebuilt every frame"""
+    key = (size, bold)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        init_fonts()
+        font = pygame.font.SysFont(FONT_SANS_BOLD if bold else FONT_SANS, size, bold=bold)
+        _FONT_CACHE[key] = font
+    return font
+
+def init_display():
+    """Import and initialize pygame and open the visualizer window"""
+    global WIN, pygame
+    if WIN is None:
+        import pygame
+        pygame.init()
+        WIN = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+        pygame.display.set_caption("Maze Solver Pro - Pathfinding Visualizer")
+        init_fonts()
+    return WIN
+
+def pump_events():
+    """Handle window close while an algorithm runs; no-op when headless"""
+    if WIN is None:
+        return
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            sys.exit()
 
 
 # =================== UTILITY FUNCTIONS FOR RESIZING ===================
@@ -136,7 +197,7 @@ class Button:
         self.hover_color = hover_color
         self.text_color = text_color
         self.is_hovered = False
-        self.font = pygame.font.SysFont(FONT_SANS_BOLD if bold else FONT_SANS, font_size, bold=bold)
+        self.font = get_font(font_size, bold)
         self.border_radius = border_radius
         
     def draw(self, win):
@@ -192,26 +253,31 @@ class Node:
     def is_end(self):
         return self.color == COLORS['end']
 
+    def _set(self, state):
+        self.color = STATE_COLORS[state]
+        if TRACE is not None:
+            TRACE.record(self, state)
+
     def reset(self):
-        self.color = COLORS['surface']
+        self._set(STATE_EMPTY)
 
     def make_start(self):
-        self.color = COLORS['start']
+        self._set(STATE_START)
 
     def make_closed(self):
-        self.color = COLORS['visited']
+        self._set(STATE_CLOSED)
 
     def make_open(self):
-        self.color = COLORS['frontier']
+        self._set(STATE_OPEN)
 
     def make_barrier(self):
-        self.color = COLORS['wall']
+        self._set(STATE_WALL)
 
     def make_end(self):
-        self.color = COLORS['end']
+        self._set(STATE_END)
 
     def make_path(self):
-        self.color = COLORS['path']
+        self._set(STATE_PATH)
 
     def draw(self, win):
         pygame.draw.rect(win, self.color, (self.x, self.y, CELL_SIZE, CELL_SIZE))
@@ -245,7 +311,8 @@ def reconstruct_path(came_from, current, draw, metrics):
         if not node.is_start():
             node.make_path()
             draw()
-            pygame.time.delay(10)
+            if WIN is not None:
+                pygame.time.delay(10)
     
     metrics['path_length'] = path_length
 
@@ -279,10 +346,7 @@ def bfs(draw, grid, start, end, metrics):
     start_time = time.time()
 
     while not queue.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        pump_events()
 
         current = queue.get()
         count_nodes += 1
@@ -324,10 +388,7 @@ def dfs(draw, grid, start, end, metrics):
     start_time = time.time()
 
     while stack:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        pump_events()
 
         current = stack.pop()
         count_nodes += 1
@@ -380,10 +441,7 @@ def dijkstra(draw, grid, start, end, metrics):
     start_time = time.time()
 
     while not pq.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        pump_events()
 
         current = pq.get()[2]
         
@@ -437,10 +495,7 @@ def a_star(draw, grid, start, end, metrics):
     start_time = time.time()
 
     while not open_set.empty():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        pump_events()
 
         current = open_set.get()[2]
         open_set_hash.remove(current)
@@ -481,15 +536,810 @@ def a_star(draw, grid, start, end, metrics):
     metrics['algorithm'] = 'A* Search'
     return False
 
+# =================== MULTI-SOURCE / MULTI-TARGET ===================
+# Each search takes collections of source and target nodes and answers
+# "nearest target from any source" in one traversal. All sources are
+# seeded into the frontier at distance 0 and every node remembers which
+# source reached it. On success the (source, target) pair is returned and
+# also stored in metrics; on failure None is returned.
+
+def h_multi(pos, target_positions):
+    return min(h(pos, t) for t in target_positions)
+
+def finish_multi(came_from, origin, target, sources, targets, draw, metrics):
+    reconstruct_path(came_from, target, draw, metrics)
+    for node in sources:
+        node.make_start()
+    for node in targets:
+        node.make_end()
+    metrics['source'] = origin[target].get_pos()
+    metrics['target'] = target.get_pos()
+    return origin[target], target
+
+def bfs_multi(draw, grid, sources, targets, metrics):
+    sources = set(sources)
+    targets = set(targets)
+    if not sources or not targets:
+        return None
+    queue = Queue()
+    came_from = {}
+    origin = {}
+    for node in sources:
+        origin[node] = node
+        queue.put(node)
+    visited = set(sources)
+    count_nodes = 0
+    start_time = time.time()
+    metrics['algorithm'] = 'Multi-Source BFS'
+
+    while not queue.empty():
+        pump_events()
+
+        current = queue.get()
+        count_nodes += 1
+
+        if current in targets:
+            pair = finish_multi(came_from, origin, current, sources, targets, draw, metrics)
+            metrics['nodes_explored'] = count_nodes
+            metrics['time'] = time.time() - start_time
+            metrics['complexity'] = 'O(V + E)'
+            metrics['optimal'] = 'Yes (unweighted)'
+            return pair
+
+        for neighbor in current.neighbors:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                came_from[neighbor] = current
+                origin[neighbor] = origin[current]
+                queue.put(neighbor)
+                if neighbor not in targets:
+                    neighbor.make_open()
+
+        draw()
+
+        if current not in sources:
+            current.make_closed()
+
+    metrics['nodes_explored'] = count_nodes
+    metrics['time'] = time.time() - start_time
+    return None
+
+def dijkstra_multi(draw, grid, sources, targets, metrics):
+    sources = set(sources)
+    targets = set(targets)
+    if not sources or not targets:
+        return None
+    count = 0
+    pq = PriorityQueue()
+    came_from = {}
+    origin = {}
+    for node in sources:
+        node.distance = 0
+        origin[node] = node
+        count += 1
+        pq.put((0, count, node))
+    visited = set()
+    count_nodes = 0
+    start_time = time.time()
+    metrics['algorithm'] = 'Multi-Source Dijkstra'
+
+    while not pq.empty():
+        pump_events()
+
+        current = pq.get()[2]
+
+        if current in visited:
+            continue
+
+        count_nodes += 1
+        visited.add(current)
+
+        if current in targets:
+            pair = finish_multi(came_from, origin, current, sources, targets, draw, metrics)
+            metrics['nodes_explored'] = count_nodes
+            metrics['time'] = time.time() - start_time
+            metrics['complexity'] = 'O((V+E)logV)'
+            metrics['optimal'] = 'Yes (weighted)'
+            return pair
+
+        for neighbor in current.neighbors:
+            if neighbor not in visited:
+                temp_dist = current.distance + 1
+                if temp_dist < neighbor.distance:
+                    neighbor.distance = temp_dist
+                    came_from[neighbor] = current
+                    origin[neighbor] = origin[current]
+                    count += 1
+                    pq.put((neighbor.distance, count, neighbor))
+                    if neighbor not in targets:
+                        neighbor.make_open()
+
+        draw()
+
+        if current not in sources:
+            current.make_closed()
+
+    metrics['nodes_explored'] = count_nodes
+    metrics['time'] = time.time() - start_time
+    return None
+
+def a_star_multi(draw, grid, sources, targets, metrics):
+    sources = set(sources)
+    targets = set(targets)
+    if not sources or not targets:
+        return None
+    # min over targets of an admissible heuristic is still admissible
+    target_positions = [node.get_pos() for node in targets]
+    count = 0
+    open_set = PriorityQueue()
+    came_from = {}
+    origin = {}
+    for node in sources:
+        node.g_score = 0
+        node.f_score = h_multi(node.get_pos(), target_positions)
+        origin[node] = node
+        count += 1
+        open_set.put((node.f_score, count, node))
+    open_set_hash = set(sources)
+    count_nodes = 0
+    start_time = time.time()
+    metrics['algorithm'] = 'Multi-Target A*'
+
+    while not open_set.empty():
+        pump_events()
+
+        current = open_set.get()[2]
+        open_set_hash.remove(current)
+        count_nodes += 1
+
+        if current in targets:
+            pair = finish_multi(came_from, origin, current, sources, targets, draw, metrics)
+            metrics['nodes_explored'] = count_nodes
+            metrics['time'] = time.time() - start_time
+            metrics['complexity'] = 'O(b^d)'
+            metrics['optimal'] = 'Yes (heuristic)'
+            return pair
+
+        for neighbor in current.neighbors:
+            temp_g_score = current.g_score + 1
+
+            if temp_g_score < neighbor.g_score:
+                came_from[neighbor] = current
+                origin[neighbor] = origin[current]
+                neighbor.g_score = temp_g_score
+                neighbor.f_score = temp_g_score + h_multi(neighbor.get_pos(), target_positions)
+                if neighbor not in open_set_hash:
+                    count += 1
+                    open_set.put((neighbor.f_score, count, neighbor))
+                    open_set_hash.add(neighbor)
+                    if neighbor not in targets:
+                        neighbor.make_open()
+
+        draw()
+
+        if current not in sources:
+            current.make_closed()
+
+    metrics['nodes_explored'] = count_nodes
+    metrics['time'] = time.time() - start_time
+    return None
+
+# =================== SEARCH TRACES ===================
+# A trace is a header (magic, version, rows, cols) followed by one varint
+# per cell state change: the zigzag-encoded delta from the previous cell
+# index, shifted left 3 bits, OR'd with the new state. Consecutive events
+# from a search are usually neighbors, so most events fit in one byte.
+TRACE_MAGIC = b'MZTR'
+TRACE_VERSION = 1
+TRACE_HEADER = struct.Struct('<4sBII')
+COLOR_STATES = {color: state for state, color in enumerate(STATE_COLORS)}
+
+class TraceRecorder:
+    def __init__(self, path, grid, buffer_size=1 << 16):
+        rows = len(grid)
+        cols = len(grid[0]) if rows else 0
+        self.file = open(path, 'wb')
+        self.file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, rows, cols))
+        self.cols = cols
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.last_index = 0
+        self.events = 0
+        self.previous = None
+        # Snapshot the walls, start and end so the replay begins from the same maze
+        for row in grid:
+            for node in row:
+                state = COLOR_STATES.get(node.color, STATE_EMPTY)
+                if state != STATE_EMPTY:
+                    self.record(node, state)
+
+    def record(self, node, state):
+        index = node.row * self.cols + node.col
+        delta = index - self.last_index
+        self.last_index = index
+        value = ((delta << 1) if delta >= 0 else ((-delta << 1) - 1)) << 3 | state
+        while value >= 0x80:
+            self.buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        self.buffer.append(value)
+        self.events += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        global TRACE
+        self.previous = TRACE
+        TRACE = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global TRACE
+        TRACE = self.previous
+        self.close()
+
+TRACE_READ_SIZE = 1 << 16
+TRACE_KEYFRAME_BYTES = 64 * 1024 * 1024
+
+def open_trace(path):
+    """Open a trace file and return (file, rows, cols), positioned after the header"""
+    f = open(path, 'rb')
+    header = f.read(TRACE_HEADER.size)
+    if len(header) < TRACE_HEADER.size:
+        f.close()
+        raise ValueError(f"{path} is not a version {TRACE_VERSION} maze trace")
+    magic, version, rows, cols = TRACE_HEADER.unpack(header)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        f.close()
+        raise ValueError(f"{path} is not a version {TRACE_VERSION} maze trace")
+    return f, rows, cols
+
+def decode_trace(f, offset, index):
+    """Stream (cell index, state, offset after event) from byte offset onwards;
+    index is the cell index of the event just before offset"""
+    value = 0
+    shift = 0
+    while True:
+        f.seek(offset)
+        block = f.read(TRACE_READ_SIZE)
+        if not block:
+            return
+        for byte in block:
+            offset += 1
+            value |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            zigzag = value >> 3
+            index += (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+            yield index, value & 0x7, offset
+            value = 0
+            shift = 0
+
+class TracePlayer:
+    """Applies trace events to a cell-state array, with keyframes for fast seeking.
+
+    Events are streamed from the file rather than held in memory. Keyframes
+    are cell snapshots; their total size stays within keyframe_bytes by
+    doubling the interval and dropping every other keyframe when full.
+    """
+    def __init__(self, path, keyframe_bytes=TRACE_KEYFRAME_BYTES):
+        self.file, self.rows, self.cols = open_trace(path)
+        self.cells = bytearray(self.rows * self.cols)
+        max_keyframes = max(2, keyframe_bytes // max(1, len(self.cells)))
+        interval = 1024
+        # (event position, byte offset, cell index of previous event, cells)
+        keyframes = [(0, TRACE_HEADER.size, 0, bytes(self.cells))]
+        total = 0
+        for index, state, offset in decode_trace(self.file, TRACE_HEADER.size, 0):
+            self.cells[index] = state
+            total += 1
+            if total % interval == 0:
+                keyframes.append((total, offset, index, bytes(self.cells)))
+                if len(keyframes) > max_keyframes:
+                    keyframes = keyframes[::2]
+                    interval *= 2
+        self.total = total
+        self.keyframes = keyframes
+        self.keyframe_positions = [k[0] for k in keyframes]
+        self.seek(0)
+
+    def seek(self, pos):
+        pos = max(0, min(self.total, pos))
+        kpos, offset, index, cells = self.keyframes[bisect_right(self.keyframe_positions, pos) - 1]
+        self.cells[:] = cells
+        self.events = decode_trace(self.file, offset, index)
+        self.pos = kpos
+        self.advance(pos - kpos)
+
+    def advance(self, n):
+        end = min(self.total, self.pos + n)
+        for _ in range(self.pos, end):
+            index, state, _ = next(self.events)
+            self.cells[index] = state
+        self.pos = end
+
+    def close(self):
+        self.file.close()
+
+def run_headless(algorithm, grid, start, end, trace_path=None, use_cache=False):
+    """Run a search without drawing, optionally streaming its trace to disk
+    or reusing a cached result for an identical maze (not both)"""
+    metrics = get_grid_stats(grid)
+    if use_cache and trace_path is None:
+        found = solve_cached(algorithm, lambda: None, grid, start, end, metrics)
+        return found, metrics
+    clear_path(grid)
+    for row in grid:
+        for node in row:
+            node.update_neighbors(grid)
+    if trace_path is None:
+        found = algorithm(lambda: None, grid, start, end, metrics)
+    else:
+        with TraceRecorder(trace_path, grid):
+            found = algorithm(lambda: None, grid, start, end, metrics)
+    return found, metrics
+
+# =================== CHUNKED OUT-OF-CORE GRID ===================
+# For mazes too large to hold as Node objects. Each cell is one byte (a
+# STATE_* value) and the grid is split into CHUNK_SIZE x CHUNK_SIZE tiles
+# stored back to back in a file. Tiles are paged in on demand and kept in
+# an LRU cache of at most cache_size chunks; dirty tiles are written back
+# when evicted.
+#
+# The chunked solvers are headless only: they take and return (row, col)
+# cells, never draw, and their cache_hits / cache_misses metrics are not
+# shown in the side panel. Use chunked_from_grid() to run them on a maze
+# built with make_grid().
+CHUNK_SIZE = 256
+CHUNK_CACHE_SIZE = 256
+CHUNK_MAGIC = b'MZCG'
+CHUNK_VERSION = 1
+CHUNK_HEADER = struct.Struct('<4sBIII')
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+class ChunkedGrid:
+    """Grid of one-byte cells in a chunked file; an existing file is reopened
+    only if its header matches, and create=True always starts a new one"""
+    def __init__(self, path, rows, cols, chunk_size=CHUNK_SIZE, cache_size=CHUNK_CACHE_SIZE, create=False):
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.chunk_size = chunk_size
+        self.chunk_bytes = chunk_size * chunk_size
+        self.chunk_cols = -(-cols // chunk_size)
+        self.chunk_rows = -(-rows // chunk_size)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.dirty = set()
+        self.hits = 0
+        self.misses = 0
+        # Most accesses land in the chunk used just before, so get/set keep
+        # it at hand and only go through the LRU cache when the chunk changes
+        self.last_row = -1
+        self.last_col = -1
+        self.last_chunk = None
+        self.last_dirty = False
+        header = CHUNK_HEADER.pack(CHUNK_MAGIC, CHUNK_VERSION, rows, cols, chunk_size)
+        self.file = open(path, 'w+b' if create or not os.path.exists(path) else 'r+b')
+        existing = self.file.read(CHUNK_HEADER.size)
+        if not existing:
+            self.file.write(header)
+        elif existing != header:
+            self.file.close()
+            raise ValueError(f"{path} is not a {rows} x {cols} chunked grid with chunk size {chunk_size}")
+        size = CHUNK_HEADER.size + self.chunk_rows * self.chunk_cols * self.chunk_bytes
+        self.file.seek(0, os.SEEK_END)
+        if self.file.tell() < size:
+            # Extending the file leaves a sparse hole of zero (empty) cells
+            self.file.truncate(size)
+
+    def _offset(self, key):
+        return CHUNK_HEADER.size + (key[0] * self.chunk_cols + key[1]) * self.chunk_bytes
+
+    def _write_chunk(self, key, chunk):
+        self.file.seek(self._offset(key))
+        self.file.write(chunk)
+
+    def _chunk(self, key):
+        chunk = self.cache.get(key)
+        if chunk is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return chunk
+        self.misses += 1
+        self.file.seek(self._offset(key))
+        chunk = bytearray(self.file.read(self.chunk_bytes))
+        self.cache[key] = chunk
+        if len(self.cache) > self.cache_size:
+            old_key, old_chunk = self.cache.popitem(last=False)
+            if old_key in self.dirty:
+                self._write_chunk(old_key, old_chunk)
+                self.dirty.discard(old_key)
+        return chunk
+
+    def _load(self, chunk_row, chunk_col):
+        self.last_chunk = self._chunk((chunk_row, chunk_col))
+        self.last_row = chunk_row
+        self.last_col = chunk_col
+        self.last_dirty = False
+
+    def chunk_for(self, row, col, write=False):
+        """Return the chunk holding (row, col) for direct indexing by the
+        solvers; pass write=True before modifying it. The reference is only
+        safe until the next access to another chunk of this grid, which may
+        evict it."""
+        cs = self.chunk_size
+        chunk_row = row // cs
+        chunk_col = col // cs
+        if chunk_row != self.last_row or chunk_col != self.last_col:
+            self._load(chunk_row, chunk_col)
+        else:
+            self.hits += 1
+        if write and not self.last_dirty:
+            self.dirty.add((chunk_row, chunk_col))
+            self.last_dirty = True
+        return self.last_chunk
+
+    def get(self, row, col):
+        cs = self.chunk_size
+        chunk_row = row // cs
+        chunk_col = col // cs
+        if chunk_row != self.last_row or chunk_col != self.last_col:
+            self._load(chunk_row, chunk_col)
+        else:
+            self.hits += 1
+        return self.last_chunk[(row - chunk_row * cs) * cs + col - chunk_col * cs]
+
+    def set(self, row, col, value):
+        cs = self.chunk_size
+        chunk_row = row // cs
+        chunk_col = col // cs
+        if chunk_row != self.last_row or chunk_col != self.last_col:
+            self._load(chunk_row, chunk_col)
+        else:
+            self.hits += 1
+        self.last_chunk[(row - chunk_row * cs) * cs + col - chunk_col * cs] = value
+        if not self.last_dirty:
+            self.dirty.add((chunk_row, chunk_col))
+            self.last_dirty = True
+
+    def is_barrier(self, row, col):
+        return self.get(row, col) == STATE_WALL
+
+    def neighbors(self, row, col):
+        result = []
+        for dr, dc in DIRECTIONS:
+            r, c = row + dr, col + dc
+            if 0 <= r < self.rows and 0 <= c < self.cols and not self.is_barrier(r, c):
+                result.append((r, c))
+        return result
+
+    def fill_random(self, density=0.3, seed=None):
+        """Write random walls one chunk at a time, bypassing the cache"""
+        rng = random.Random(seed)
+        # Map each random byte to a wall when it falls below density * 256,
+        # so a whole chunk is generated with one randbytes() + translate()
+        threshold = round(density * 256)
+        table = bytes(STATE_WALL if b < threshold else STATE_EMPTY for b in range(256))
+        self.flush()
+        self.cache.clear()
+        self.last_row = self.last_col = -1
+        self.last_chunk = None
+        for chunk_row in range(self.chunk_rows):
+            for chunk_col in range(self.chunk_cols):
+                chunk = rng.randbytes(self.chunk_bytes).translate(table)
+                self._write_chunk((chunk_row, chunk_col), chunk)
+
+    def flush(self):
+        for key in self.dirty:
+            if key in self.cache:
+                self._write_chunk(key, self.cache[key])
+        self.dirty.clear()
+        self.last_dirty = False
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def chunked_from_grid(path, grid, chunk_size=CHUNK_SIZE, cache_size=CHUNK_CACHE_SIZE):
+    """Copy the walls of a make_grid() maze into a new ChunkedGrid at path,
+    replacing any file already there"""
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    cgrid = ChunkedGrid(path, rows, cols, chunk_size, cache_size, create=True)
+    for row in grid:
+        for node in row:
+            if node.is_barrier():
+                cgrid.set(node.row, node.col, STATE_WALL)
+    cgrid.flush()
+    return cgrid
+
+# Per-search scratch cells: 0 = unseen, 1-4 = reached via DIRECTIONS[v - 1],
+# SCRATCH_SOURCE for the start; SCRATCH_CLOSED is OR'd in once expanded
+SCRATCH_SOURCE = 5
+SCRATCH_CLOSED = 8
+
+def open_scratch(cgrid):
+    fd, path = tempfile.mkstemp(suffix='.search', dir=os.path.dirname(os.path.abspath(cgrid.path)))
+    os.close(fd)
+    return ChunkedGrid(path, cgrid.rows, cgrid.cols, cgrid.chunk_size, cgrid.cache_size, create=True)
+
+def close_scratch(scratch, cgrid, metrics, hits, misses):
+    metrics['cache_hits'] = cgrid.hits + scratch.hits - hits
+    metrics['cache_misses'] = cgrid.misses + scratch.misses - misses
+    scratch.file.close()
+    os.remove(scratch.path)
+
+def chunked_path(scratch, end):
+    path = [end]
+    row, col = end
+    while True:
+        step = scratch.get(row, col) & 7
+        if step == SCRATCH_SOURCE:
+            break
+        dr, dc = DIRECTIONS[step - 1]
+        row, col = row - dr, col - dc
+        path.append((row, col))
+    path.reverse()
+    return path
+
+def chunk_moves(cs):
+    """(step, dr, dc, offset within a chunk) for each of DIRECTIONS"""
+    return [(step, dr, dc, dr * cs + dc) for step, (dr, dc) in enumerate(DIRECTIONS, 1)]
+
+def bfs_chunked(cgrid, start, end, metrics):
+    """BFS over a ChunkedGrid; returns the list of (row, col) cells or None"""
+    hits, misses = cgrid.hits, cgrid.misses
+    scratch = open_scratch(cgrid)
+    rows, cols, cs = cgrid.rows, cgrid.cols, cgrid.chunk_size
+    moves = chunk_moves(cs)
+    count_nodes = 0
+    start_time = time.time()
+    metrics['algorithm'] = 'Breadth-First Search (chunked)'
+    metrics['grid_size'] = f"{rows} x {cols}"
+    try:
+        queue = deque([start])
+        scratch.set(*start, SCRATCH_SOURCE)
+
+        while queue:
+            current = queue.popleft()
+            count_nodes += 1
+
+            if current == end:
+                path = chunked_path(scratch, end)
+                metrics['path_length'] = len(path) - 1
+                metrics['nodes_explored'] = count_nodes
+                metrics['time'] = time.time() - start_time
+                metrics['complexity'] = 'O(V + E)'
+                metrics['optimal'] = 'Yes (unweighted)'
+                return path
+
+            row, col = current
+            local_row = row % cs
+            local_col = col % cs
+            base = local_row * cs + local_col
+            walls = cgrid.chunk_for(row, col)
+            seen = scratch.chunk_for(row, col, write=True)
+            for step, dr, dc, offset in moves:
+                r, c = row + dr, col + dc
+                if not (0 <= r < rows and 0 <= c < cols):
+                    continue
+                if 0 <= local_row + dr < cs and 0 <= local_col + dc < cs:
+                    i = base + offset
+                    if seen[i] or walls[i] == STATE_WALL:
+                        continue
+                    seen[i] = step
+                else:
+                    # Neighbor in another chunk: go through get/set, then
+                    # re-fetch this cell's chunks in case they were evicted
+                    blocked = scratch.get(r, c) or cgrid.is_barrier(r, c)
+                    if not blocked:
+                        scratch.set(r, c, step)
+                    walls = cgrid.chunk_for(row, col)
+                    seen = scratch.chunk_for(row, col, write=True)
+                    if blocked:
+                        continue
+                queue.append((r, c))
+
+        metrics['nodes_explored'] = count_nodes
+        metrics['time'] = time.time() - start_time
+        return None
+    finally:
+        close_scratch(scratch, cgrid, metrics, hits, misses)
+
+def a_star_chunked(cgrid, start, end, metrics):
+    """A* over a ChunkedGrid; returns the list of (row, col) cells or None"""
+    hits, misses = cgrid.hits, cgrid.misses
+    scratch = open_scratch(cgrid)
+    rows, cols, cs = cgrid.rows, cgrid.cols, cgrid.chunk_size
+    moves = chunk_moves(cs)
+    end_row, end_col = end
+    count_nodes = 0
+    start_time = time.time()
+    metrics['algorithm'] = 'A* Search (chunked)'
+    metrics['grid_size'] = f"{rows} x {cols}"
+    try:
+        count = 0
+        open_set = [(h(start, end), count, 0, start)]
+        # g-scores are kept only for the frontier; Manhattan distance is
+        # consistent on a unit grid, so expanded cells never reopen
+        open_g = {start: 0}
+        scratch.set(*start, SCRATCH_SOURCE)
+
+        while open_set:
+            _, _, g_score, current = heapq.heappop(open_set)
+            row, col = current
+            local_row = row % cs
+            local_col = col % cs
+            base = local_row * cs + local_col
+            walls = cgrid.chunk_for(row, col)
+            seen = scratch.chunk_for(row, col, write=True)
+            state = seen[base]
+            if state & SCRATCH_CLOSED:
+                continue
+            seen[base] = state | SCRATCH_CLOSED
+            del open_g[current]
+            count_nodes += 1
+
+            if current == end:
+                path = chunked_path(scratch, end)
+                metrics['path_length'] = len(path) - 1
+                metrics['nodes_explored'] = count_nodes
+                metrics['time'] = time.time() - start_time
+                metrics['complexity'] = 'O(b^d)'
+                metrics['optimal'] = 'Yes (heuristic)'
+                return path
+
+            temp_g_score = g_score + 1
+            for step, dr, dc, offset in moves:
+                r, c = row + dr, col + dc
+                if not (0 <= r < rows and 0 <= c < cols):
+                    continue
+                if 0 <= local_row + dr < cs and 0 <= local_col + dc < cs:
+                    i = base + offset
+                    if walls[i] == STATE_WALL or seen[i] & SCRATCH_CLOSED:
+                        continue
+                    if temp_g_score >= open_g.get((r, c), math.inf):
+                        continue
+                    seen[i] = step
+                else:
+                    # Neighbor in another chunk: go through get/set, then
+                    # re-fetch this cell's chunks in case they were evicted
+                    better = not cgrid.is_barrier(r, c) and not scratch.get(r, c) & SCRATCH_CLOSED \
+                        and temp_g_score < open_g.get((r, c), math.inf)
+                    if better:
+                        scratch.set(r, c, step)
+                    walls = cgrid.chunk_for(row, col)
+                    seen = scratch.chunk_for(row, col, write=True)
+                    if not better:
+                        continue
+                open_g[(r, c)] = temp_g_score
+                count += 1
+                f_score = temp_g_score + abs(r - end_row) + abs(c - end_col)
+                heapq.heappush(open_set, (f_score, count, temp_g_score, (r, c)))
+
+        metrics['nodes_explored'] = count_nodes
+        metrics['time'] = time.time() - start_time
+        return None
+    finally:
+        close_scratch(scratch, cgrid, metrics, hits, misses)
+
+# =================== PATH RESULT CACHE ===================
+# Results are keyed by (maze version, start, end, algorithm). main() bumps
+# MAZE_VERSION on every wall edit; headless callers key on a hash of the
+# walls instead. Each entry keeps the final search overlay (one STATE_*
+# byte per cell) so a hit redraws exactly what the search left behind.
+# The memory cap is an estimate: an entry is counted as its overlay plus a
+# flat PATH_CACHE_ENTRY_OVERHEAD for the key and stored metrics dict
+PATH_CACHE_BYTES = 16 * 1024 * 1024
+PATH_CACHE_ENTRY_OVERHEAD = 512
+
+class PathCache:
+    def __init__(self, max_bytes=PATH_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, found, overlay, metrics):
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key)[1]) + PATH_CACHE_ENTRY_OVERHEAD
+        self.entries[key] = (found, overlay, metrics)
+        self.bytes += len(overlay) + PATH_CACHE_ENTRY_OVERHEAD
+        while self.bytes > self.max_bytes and self.entries:
+            _, (_, old_overlay, _) = self.entries.popitem(last=False)
+            self.bytes -= len(old_overlay) + PATH_CACHE_ENTRY_OVERHEAD
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+PATH_CACHE = PathCache()
+MAZE_VERSION = 0
+
+def bump_maze_version():
+    global MAZE_VERSION
+    MAZE_VERSION += 1
+
+def maze_hash(grid):
+    walls = bytes(node.is_barrier() for row in grid for node in row)
+    digest = hashlib.blake2b(walls, digest_size=16).hexdigest()
+    return f"{len(grid)}x{len(grid[0]) if grid else 0}:{digest}"
+
+def capture_overlay(grid):
+    return bytes(COLOR_STATES.get(node.color, STATE_EMPTY) for row in grid for node in row)
+
+def apply_overlay(grid, overlay):
+    cols = len(grid[0]) if grid else 0
+    for row in grid:
+        for node in row:
+            state = overlay[node.row * cols + node.col]
+            if state in (STATE_OPEN, STATE_CLOSED, STATE_PATH):
+                node.color = STATE_COLORS[state]
+
+def solve_cached(algorithm, draw, grid, start, end, metrics, version=None):
+    """Run algorithm, or restore its earlier result for the same maze and endpoints"""
+    start_time = time.time()
+    if version is None:
+        version = maze_hash(grid)
+    key = (version, start.get_pos(), end.get_pos(), algorithm.__name__)
+    clear_path(grid)
+    cached = PATH_CACHE.get(key)
+    if cached is not None:
+        found, overlay, cached_metrics = cached
+        apply_overlay(grid, overlay)
+        metrics.update(cached_metrics)
+        # Report how long the lookup took, not the original search time
+        metrics['time'] = time.time() - start_time
+        metrics['cached'] = True
+        return found
+
+    for row in grid:
+        for node in row:
+            node.update_neighbors(grid)
+    found = algorithm(draw, grid, start, end, metrics)
+    start.make_start()
+    end.make_end()
+    metrics['cached'] = False
+    PATH_CACHE.put(key, found, capture_overlay(grid), dict(metrics))
+    return found
+
 # =================== UI DRAWING ===================
 def draw_header(win, buttons):
     pygame.draw.rect(win, COLORS['surface'], (0, 0, WIDTH, HEADER_HEIGHT))
     
-    title_font = pygame.font.SysFont(FONT_SANS_BOLD, 32, bold=True)
+    title_font = get_font(32, bold=True)
     title = title_font.render('Maze Solver Pro', True, COLORS['text_header'])
     win.blit(title, (20, 16))
     
-    subtitle_font = pygame.font.SysFont(FONT_SANS, 14)
+    subtitle_font = get_font(14)
     subtitle = subtitle_font.render('Pathfinding Algorithm Visualizer', True, COLORS['text_dim'])
     win.blit(subtitle, (20, 52))
     
@@ -501,19 +1351,19 @@ def draw_metric_card(win, x, y, width, height, label, value):
     pygame.draw.rect(win, COLORS['surface_dark'], card_rect, border_radius=10)
     pygame.draw.rect(win, COLORS['surface_light'], card_rect, 1, border_radius=10)
     
-    font_label = pygame.font.SysFont(FONT_SANS, 13)
+    font_label = get_font(13)
     label_surface = font_label.render(label, True, COLORS['text_dim'])
     win.blit(label_surface, (x + 15, y + 12))
     
-    font_value = pygame.font.SysFont(FONT_SANS_BOLD, 20, bold=True)
+    font_value = get_font(20, bold=True)
     value_surface = font_value.render(str(value), True, COLORS['text'])
     win.blit(value_surface, (x + 15, y + 32))
 
 def draw_side_panel(win, metrics):
     pygame.draw.rect(win, COLORS['surface'], (PANEL_X_START, 0, PANEL_WIDTH, HEIGHT))
     
-    font_title = pygame.font.SysFont(FONT_SANS_BOLD, 20, bold=True)
-    font_normal = pygame.font.SysFont(FONT_SANS, 14)
+    font_title = get_font(20, bold=True)
+    font_normal = get_font(14)
     
     y_offset = HEADER_HEIGHT + 30
     
@@ -526,7 +1376,7 @@ def draw_side_panel(win, metrics):
     
     metric_items = [
         ('Algorithm', metrics.get('algorithm', 'N/A')),
-        ('Time', f"{metrics.get('time', 0):.4f} s"),
+        ('Time (cached)' if metrics.get('cached') else 'Time', f"{metrics.get('time', 0):.4f} s"),
         ('Nodes Explored', str(metrics.get('nodes_explored', 0))),
         ('Path Length', str(metrics.get('path_length', 0))),
         ('Grid Size', metrics.get('grid_size', 'N/A')),
@@ -624,7 +1474,240 @@ def clear_path(grid):
             node.g_score = math.inf
             node.f_score = math.inf
 
+# =================== TRACE REPLAY ===================
+# Replay draws straight from TracePlayer.cells: the cell array is wrapped
+# as an 8-bit palettized surface, and only the visible window of cells is
+# scaled into the view, so traces larger than the window can be panned and
+# zoomed instead of building a Node per cell.
+REPLAY_MAX_SCALE = 32.0
+
+def replay_view_rect():
+    return pygame.Rect(20, HEADER_HEIGHT + 20, PANEL_X_START - 40, HEIGHT - HEADER_HEIGHT - 110)
+
+def scrub_bar_rect():
+    return pygame.Rect(50, HEIGHT - 40, PANEL_X_START - 100, 10)
+
+class ReplayView:
+    """Pan/zoom state for the replay: view center in cells and pixels per cell"""
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.fit()
+
+    def min_scale(self):
+        view = replay_view_rect()
+        return min(view.width / max(1, self.cols), view.height / max(1, self.rows))
+
+    def fit(self):
+        self.scale = self.min_scale()
+        self.center_x = self.cols / 2
+        self.center_y = self.rows / 2
+
+    def zoom_at(self, pos, factor):
+        view = replay_view_rect()
+        # Keep the cell under the cursor in place while zooming
+        cell_x = self.center_x + (pos[0] - view.centerx) / self.scale
+        cell_y = self.center_y + (pos[1] - view.centery) / self.scale
+        self.scale = min(REPLAY_MAX_SCALE, max(self.min_scale(), self.scale * factor))
+        self.center_x = cell_x - (pos[0] - view.centerx) / self.scale
+        self.center_y = cell_y - (pos[1] - view.centery) / self.scale
+
+    def pan(self, dx, dy):
+        self.center_x -= dx / self.scale
+        self.center_y -= dy / self.scale
+
+    def draw(self, win, cells):
+        view = replay_view_rect()
+        pygame.draw.rect(win, (30, 40, 60), view)
+        if not self.rows or not self.cols:
+            return
+        left = self.center_x - view.width / 2 / self.scale
+        top = self.center_y - view.height / 2 / self.scale
+        x0 = max(0, int(left))
+        y0 = max(0, int(top))
+        x1 = min(self.cols, math.ceil(left + view.width / self.scale))
+        y1 = min(self.rows, math.ceil(top + view.height / self.scale))
+        if x0 < x1 and y0 < y1:
+            surface = pygame.image.frombuffer(cells, (self.cols, self.rows), 'P')
+            surface.set_palette([color[:3] for color in STATE_COLORS])
+            visible = surface.subsurface((x0, y0, x1 - x0, y1 - y0))
+            size = (max(1, round((x1 - x0) * self.scale)), max(1, round((y1 - y0) * self.scale)))
+            dest = (view.x + round((x0 - left) * self.scale), view.y + round((y0 - top) * self.scale))
+            win.set_clip(view)
+            win.blit(pygame.transform.scale(visible, size), dest)
+            win.set_clip(None)
+        pygame.draw.rect(win, COLORS['surface_light'], view, 1)
+
+def draw_scrub_bar(win, player, speed, playing):
+    bar = scrub_bar_rect()
+    pygame.draw.rect(win, COLORS['surface_dark'], bar, border_radius=5)
+    if player.total:
+        filled = bar.copy()
+        filled.width = int(bar.width * player.pos / player.total)
+        pygame.draw.rect(win, COLORS['primary'], filled, border_radius=5)
+    pygame.draw.rect(win, COLORS['surface_light'], bar, 1, border_radius=5)
+
+    status = 'Playing' if playing else 'Paused'
+    text = (f"{status}  {player.pos}/{player.total} events  {speed:g} ev/s   "
+            "Space: play/pause  Left/Right: seek  Up/Down: speed  "
+            "Wheel: zoom  Right-drag: pan  F: fit  Esc: quit")
+    label = get_font(13).render(text, True, COLORS['text_dim'])
+    win.blit(label, (bar.x, bar.y - 25))
+
+def replay(win, path):
+    player = TracePlayer(path)
+    view = ReplayView(player.rows, player.cols)
+    _, window_buttons = create_buttons()
+    metrics = {'algorithm': 'Trace Replay', 'grid_size': f"{player.rows} x {player.cols}"}
+
+    speed = 600.0
+    pending = 0.0
+    playing = True
+    scrubbing = False
+    clock = pygame.time.Clock()
+    run = True
+
+    while run:
+        dt = clock.tick(60) / 1000
+        if playing and not scrubbing:
+            pending += speed * dt
+            steps = int(pending)
+            pending -= steps
+            player.advance(steps)
+            if player.pos >= player.total:
+                playing = False
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+
+            if event.type == pygame.VIDEORESIZE:
+                recalculate_dimensions(event.w, event.h)
+                win = pygame.display.set_mode((WIDTH, HEIGHT), pygame.RESIZABLE)
+                _, window_buttons = create_buttons()
+                view.fit()
+
+            if window_buttons[0].handle_event(event):
+                run = False
+            if window_buttons[1].handle_event(event):
+                pygame.display.iconify()
+
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if scrub_bar_rect().inflate(0, 20).collidepoint(event.pos):
+                    scrubbing = True
+            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                scrubbing = False
+            if scrubbing and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+                bar = scrub_bar_rect()
+                fraction = min(1, max(0, (event.pos[0] - bar.x) / bar.width))
+                player.seek(int(fraction * player.total))
+
+            if event.type == pygame.MOUSEWHEEL:
+                pos = pygame.mouse.get_pos()
+                if replay_view_rect().collidepoint(pos):
+                    view.zoom_at(pos, 1.25 ** event.y)
+            if event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                view.pan(*event.rel)
+
+            if event.type == pygame.KEYDOWN:
+                step = max(1, player.total // 100)
+                if event.key == pygame.K_SPACE:
+                    if player.pos >= player.total:
+                        player.seek(0)
+                    playing = not playing
+                if event.key == pygame.K_RIGHT:
+                    player.seek(player.pos + step)
+                if event.key == pygame.K_LEFT:
+                    player.seek(player.pos - step)
+                if event.key == pygame.K_UP:
+                    speed *= 2
+                if event.key == pygame.K_DOWN:
+                    speed = max(1.0, speed / 2)
+                if event.key == pygame.K_HOME:
+                    player.seek(0)
+                if event.key == pygame.K_END:
+                    player.seek(player.total)
+                if event.key == pygame.K_f:
+                    view.fit()
+                if event.key == pygame.K_ESCAPE:
+                    run = False
+
+        metrics['nodes_explored'] = player.pos
+
+        win.fill(COLORS['bg'])
+        draw_side_panel(win, metrics)
+        draw_header(win, window_buttons)
+        view.draw(win, player.cells)
+        draw_scrub_bar(win, player, speed, playing)
+        pygame.display.update()
+
+    player.close()
+    pygame.quit()
+    sys.exit()
+
+# =================== SELF-TEST ===================
+def selftest(seed=0):
+    """Check the trace format round trip and TracePlayer seeking.
+
+    python maze_solver.py --selftest
+    """
+    rng = random.Random(seed)
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, 'selftest.mzt')
+    try:
+        # Round trip: replaying a recorded solve ends on the solver's final grid
+        random.seed(seed)
+        grid = make_grid()
+        generate_random_maze(grid, 0.2)
+        start, end = grid[0][0], grid[ROWS - 1][COLS - 1]
+        start.make_start()
+        end.make_end()
+        run_headless(bfs, grid, start, end, path)
+        player = TracePlayer(path)
+        assert (player.rows, player.cols) == (ROWS, COLS)
+        player.seek(player.total)
+        assert bytes(player.cells) == capture_overlay(grid), "replay does not match solved grid"
+        player.close()
+
+        # Large forward and backward index deltas survive zigzag varints
+        rows = cols = 1000
+        nodes = [Node(rng.randrange(rows), rng.randrange(cols)) for _ in range(20000)]
+        nodes += [Node(rows - 1, cols - 1), Node(0, 0), Node(rows - 1, cols - 1)]
+        recorder = TraceRecorder(path, [[Node(r, 0) for _ in range(cols)] for r in range(rows)])
+        expected = []
+        for node in nodes:
+            state = rng.randrange(len(STATE_COLORS))
+            recorder.record(node, state)
+            expected.append((node.row * cols + node.col, state))
+        recorder.close()
+        with open_trace(path)[0] as f:
+            decoded = [(index, state) for index, state, _ in decode_trace(f, TRACE_HEADER.size, 0)]
+        assert decoded == expected, "decoded events differ from recorded events"
+
+        # Random seeks match linear replay, with a keyframe budget small
+        # enough to force the interval to double several times
+        linear = TracePlayer(path, keyframe_bytes=rows * cols * 4)
+        assert linear.total == len(expected)
+        positions = sorted(rng.randrange(linear.total + 1) for _ in range(300))
+        snapshots = {}
+        linear.seek(0)
+        for pos in positions:
+            linear.advance(pos - linear.pos)
+            snapshots[pos] = bytes(linear.cells)
+        linear.close()
+        player = TracePlayer(path, keyframe_bytes=rows * cols * 4)
+        assert 2 <= len(player.keyframes) <= 4, "keyframes were not thinned to the budget"
+        for pos in rng.sample(positions, len(positions)):
+            player.seek(pos)
+            assert player.pos == pos and bytes(player.cells) == snapshots[pos], f"seek({pos}) mismatch"
+        player.close()
+    finally:
+        shutil.rmtree(tmp_dir)
+    print("selftest ok")
+
 # =================== MAIN LOOP ===================
+ALGORITHMS = [bfs, dfs, dijkstra, a_star]
+
 def main(win):
     grid = make_grid()
     start = None
@@ -632,6 +1715,7 @@ def main(win):
     metrics = get_grid_stats(grid)
     
     buttons, window_buttons = create_buttons()
+    algorithm_keys = {pygame.K_b: bfs, pygame.K_d: dfs, pygame.K_j: dijkstra, pygame.K_a: a_star}
     
     run = True
     drawing = False
@@ -660,21 +1744,10 @@ def main(win):
             for i, button in enumerate(buttons):
                 if button.handle_event(event):
                     if i < 4 and start and end:
-                        clear_path(grid)
-                        for row in grid:
-                            for node in row:
-                                node.update_neighbors(grid)
-                        
                         metrics = get_grid_stats(grid) 
                         
-                        if i == 0:
-                            bfs(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
-                        elif i == 1:
-                            dfs(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
-                        elif i == 2:
-                            dijkstra(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
-                        elif i == 3:
-                            a_star(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
+                        solve_cached(ALGORITHMS[i], lambda: draw(win, grid, buttons, window_buttons, metrics),
+                                     grid, start, end, metrics, MAZE_VERSION)
                         
                         start.make_start()
                         end.make_end()
@@ -683,6 +1756,7 @@ def main(win):
                         start = None
                         end = None
                         grid = make_grid()
+                        bump_maze_version()
                         obstacle_count = generate_random_maze(grid, 0.25)
                         metrics = get_grid_stats(grid)
                         
@@ -690,6 +1764,7 @@ def main(win):
                         start = None
                         end = None
                         grid = make_grid()
+                        bump_maze_version()
                         metrics = get_grid_stats(grid)
 
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -709,13 +1784,18 @@ def main(win):
                 if row is not None and col is not None:
                     node = grid[row][col]
                     if not start and node != end:
+                        if node.is_barrier():
+                            bump_maze_version()
                         start = node
                         start.make_start()
                     elif not end and node != start:
+                        if node.is_barrier():
+                            bump_maze_version()
                         end = node
                         end.make_end()
-                    elif node != end and node != start:
+                    elif node != end and node != start and not node.is_barrier():
                         node.make_barrier()
+                        bump_maze_version()
                         metrics = get_grid_stats(grid)
 
             if pygame.mouse.get_pressed()[2]:
@@ -723,6 +1803,8 @@ def main(win):
                 row, col = get_clicked_pos(pos)
                 if row is not None and col is not None:
                     node = grid[row][col]
+                    if node.is_barrier():
+                        bump_maze_version()
                     node.reset()
                     if node == start:
                         start = None
@@ -734,20 +1816,10 @@ def main(win):
                 if (event.key == pygame.K_b or event.key == pygame.K_d or \
                     event.key == pygame.K_j or event.key == pygame.K_a) and start and end:
                     
-                    clear_path(grid)
-                    for row in grid:
-                        for node in row:
-                            node.update_neighbors(grid)
                     metrics = get_grid_stats(grid)
 
-                    if event.key == pygame.K_b:
-                        bfs(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
-                    if event.key == pygame.K_d:
-                        dfs(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
-                    if event.key == pygame.K_j:
-                        dijkstra(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
-                    if event.key == pygame.K_a:
-                        a_star(lambda: draw(win, grid, buttons, window_buttons, metrics), grid, start, end, metrics)
+                    solve_cached(algorithm_keys[event.key], lambda: draw(win, grid, buttons, window_buttons, metrics),
+                                 grid, start, end, metrics, MAZE_VERSION)
                     
                     start.make_start()
                     end.make_end()
@@ -756,6 +1828,7 @@ def main(win):
                     start = None
                     end = None
                     grid = make_grid()
+                    bump_maze_version()
                     obstacle_count = generate_random_maze(grid, 0.25)
                     metrics = get_grid_stats(grid)
 
@@ -763,10 +1836,18 @@ def main(win):
                     start = None
                     end = None
                     grid = make_grid()
+                    bump_maze_version()
                     metrics = get_grid_stats(grid)
 
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main(WIN)
\ No newline at end of file
+    # python maze_solver.py --replay trace.mzt
+    # python maze_solver.py --selftest
+    if len(sys.argv) == 2 and sys.argv[1] == '--selftest':
+        selftest()
+        sys.exit()
+    if len(sys.argv) == 3 and sys.argv[1] == '--replay':
+        replay(init_display(), sys.argv[2])
+    main(init_display())
\ No newline at end of file